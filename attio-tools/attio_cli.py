@@ -2,59 +2,94 @@
 import os
 import sys
 import json
-import requests
+import atexit
+import urllib3
 import click
-from dotenv import load_dotenv
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from attio_common import load_env, API_BASE_URL
 
 # Initialize Rich console
 console = Console()
 
 # Load environment variables
-load_dotenv(os.path.join(os.path.dirname(__file__), "crm_migration", ".env"))
+load_env(os.path.join(os.path.dirname(__file__), "crm_migration", ".env"))
 
 ATTIO_API_TOKEN = os.getenv("ATTIO_API_TOKEN")
-API_BASE_URL = "https://api.attio.com/v2"
 
 if not ATTIO_API_TOKEN:
     console.print("[red]Error: ATTIO_API_TOKEN not found in .env file[/red]")
     sys.exit(1)
 
-def get_headers():
-    return {
+# Shared urllib3 pool (no requests layer) so repeated calls reuse the TLS
+# connection to Attio. Auth lives on the pool, so call sites never rebuild headers.
+HTTP = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=20,
+    headers={
         "Authorization": f"Bearer {ATTIO_API_TOKEN}",
         "Content-Type": "application/json"
-    }
+    },
+    retries=urllib3.Retry(
+        total=6,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        allowed_methods=frozenset(["GET", "PUT", "POST"])
+    )
+)
+atexit.register(HTTP.clear)
+
+def attio_request(method, path, payload=None):
+    """Send a request to the Attio API and return the decoded JSON body."""
+    body = json.dumps(payload).encode() if payload is not None else None
+    response = HTTP.request(method, f"{API_BASE_URL}{path}", body=body)
+    if response.status >= 400:
+        raise RuntimeError(f"HTTP {response.status}: {response.data.decode(errors='replace')}")
+    return json.loads(response.data)
 
 @click.group()
 def cli():
     """Attio CRM CLI Tool"""
     pass
 
+# (header, style) for each column of the list-objects table
+_OBJECT_COLUMNS = [
+    ("Slug", "cyan"),
+    ("Object ID", "green"),
+    ("Singular", "magenta"),
+    ("Plural", "magenta")
+]
+
 @cli.command()
 def list_objects():
     """List all available objects in Attio."""
-    url = f"{API_BASE_URL}/objects"
     try:
-        response = requests.get(url, headers=get_headers())
-        response.raise_for_status()
-        data = response.json()
-        
-        table = Table(title="Attio Objects")
-        table.add_column("Slug", style="cyan")
-        table.add_column("Object ID", style="green")
-        table.add_column("Singular", style="magenta")
-        table.add_column("Plural", style="magenta")
+        data = attio_request("GET", "/objects")
         
-        for obj in data.get("data", []):
-            table.add_row(
+        rows = (
+            (
                 obj['api_slug'],
                 obj['id']['object_id'],
-                obj.get('singular_noun', '-'),
-                obj.get('plural_noun', '-')
+                obj.get('singular_noun') or '-',
+                obj.get('plural_noun') or '-'
             )
+            for obj in data.get("data", [])
+        )
+        
+        # When piped, emit plain TSV instead of paying for Rich layout.
+        if not sys.stdout.isatty():
+            sys.stdout.write("\t".join(name for name, _ in _OBJECT_COLUMNS) + "\n")
+            sys.stdout.writelines("\t".join(row) + "\n" for row in rows)
+            return
+        
+        # Imported here so `--help` and piped runs skip loading rich's table machinery.
+        from rich.table import Table
+        
+        table = Table(title="Attio Objects")
+        for name, style in _OBJECT_COLUMNS:
+            table.add_column(name, style=style, no_wrap=True)
+        for row in rows:
+            table.add_row(*row)
             
         console.print(table)
         
@@ -65,34 +100,46 @@ def list_objects():
 @click.argument('email')
 def find_person(email):
     """Find a person by email address."""
-    # To find by email, we technically need to assert unique or search.
-    # We can use the PUT / assert_unique endpoint to find/create, 
-    # OR we can filter via API if supported (Attio v2 filtering is via POST /query usually).
-    # For CLI simplicity, we'll try to assert_unique with just email to retrieve the record without changing it 
-    # (if it exists, it returns it; if not, it creates it - wait, that's dangerous for 'find').
-    # Better to use POST /objects/people/records/query if available, but v2 uses a specific query structure.
-    # Let's use the 'identify' trick (PUT) but be careful, or just list recent.
+    from rich.table import Table
     
-    # Actually, proper way is POST /v2/objects/people/records/query
-    url = f"{API_BASE_URL}/objects/people/records/query"
+    # Single filtered query; exact match on the compound email attribute.
     payload = {
         "filter": {
-            "$and": [
-                {
-                    "field": "email_addresses",
-                    "operator": "contains", 
-                    "value": email 
-                    # Note: 'contains' might not be exact. 'equals' is better if supported for email struct.
-                    # Email attribute is complex. Attio filtering on complex attributes can be tricky.
-                }
-            ]
+            "email_addresses": {
+                "email_address": {"$eq": email}
+            }
         },
         "limit": 1
     }
     
-    # Simpler approach: Just verify connection by listing objects is usually enough for "connect via cli".
-    # But let's try to fetch the object we just migrated if user asks.
-    console.print("[yellow]Search not implemented in simple CLI yet. Use list-objects to verify connection.[/yellow]")
+    try:
+        records = attio_request("POST", "/objects/people/records/query", payload).get("data", [])
+        
+        if not records:
+            console.print(f"[yellow]No person found with email {email}[/yellow]")
+            return
+        
+        record = records[0]
+        values = record.get("values", {})
+        name_vals = values.get("name", [])
+        title_vals = values.get("job_title", [])
+        
+        table = Table(title="Attio Person")
+        table.add_column("Record ID", style="green")
+        table.add_column("Name", style="cyan")
+        table.add_column("Emails", style="magenta")
+        table.add_column("Job Title", style="magenta")
+        table.add_row(
+            record['id']['record_id'],
+            name_vals[0].get('full_name', '-') if name_vals else '-',
+            ", ".join(e.get('email_address', '') for e in values.get("email_addresses", [])) or '-',
+            title_vals[0].get('value', '-') if title_vals else '-'
+        )
+        
+        console.print(table)
+        
+    except Exception as e:
+        console.print(f"[red]Error searching people: {str(e)}[/red]")
 
 if __name__ == "__main__":
     cli()
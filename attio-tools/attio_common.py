@@ -0,0 +1,133 @@
+"""Helpers shared by the attio-tools scripts: .env loading, the HTTP/2 client,
+the retrying request loop, and paging through a records query."""
+import os
+import random
+import asyncio
+import httpx
+
+API_BASE_URL = "https://api.attio.com/v2"
+
+# Transient statuses worth another attempt; anything else is returned to the caller
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+MAX_ATTEMPTS = 5
+
+def load_env(path: str):
+    """Populate os.environ from a simple KEY=VALUE .env file, without python-dotenv.
+
+    Skipped entirely when ATTIO_API_TOKEN is already exported.
+    """
+    if "ATTIO_API_TOKEN" in os.environ or not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            os.environ.setdefault(key.strip(), value.strip().strip("'\""))
+
+def make_client(token, **kwargs):
+    """One pooled HTTP/2 client for a whole run, with auth set once on the client
+    so call sites never rebuild headers. Needs the `h2` package (httpx[http2])."""
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        http2=True,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        },
+        **kwargs
+    )
+
+async def attio_request(client, method, url, limiter=None, **kwargs):
+    """Send a request, retrying 429/5xx and dropped connections with jittered
+    exponential backoff (or the server's Retry-After). The final response is
+    returned as-is, with the number of attempts in resp.extensions["attempts"];
+    callers check its status.
+
+    With a `limiter` (anything with async acquire() and pause(seconds)), every
+    attempt waits for a token and a 429 pauses it, so concurrent writers back
+    off together.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        last_attempt = attempt == MAX_ATTEMPTS - 1
+        if limiter:
+            await limiter.acquire()
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            resp = None
+
+        if resp is not None and (resp.status_code not in RETRY_STATUSES or last_attempt):
+            resp.extensions["attempts"] = attempt + 1
+            return resp
+
+        retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = min(30.0, 2 ** attempt) + random.uniform(0, 1)
+        if limiter and resp is not None and resp.status_code == 429:
+            limiter.pause(delay)
+        else:
+            await asyncio.sleep(delay)
+
+async def iter_query_pages(client, object_slug, progress):
+    """Yield each page of records, oldest first, as it arrives, so callers index
+    them without holding the whole object in memory. Counts are shown on a
+    `progress` task."""
+    task = progress.add_task(f"Fetching {object_slug}", total=None)
+    url = f"/objects/{object_slug}/records/query"
+    fetched = 0
+    limit = 1000
+    offset = 0
+    cursor = None
+
+    # The /query endpoint pages with "limit" and "offset" inside the body; when a
+    # response carries meta.next_cursor we switch to cursor paging for the rest.
+    while True:
+        payload = {
+            "limit": limit,
+            # The records query takes an array of sorts; a singular "sort" is not part of it
+            "sorts": [
+                {"attribute": "created_at", "direction": "asc"}
+            ]
+        }
+        # Follow the server's cursor once it hands one out (no skip-scan per page)
+        if cursor:
+            payload["cursor"] = cursor
+        else:
+            payload["offset"] = offset
+
+        try:
+            resp = await attio_request(client, "POST", url, json=payload)
+        except httpx.HTTPError as e:
+            print(f"Error fetching {object_slug}: {e}")
+            break
+        if resp.is_error:
+            print(f"Error fetching {object_slug}: HTTP {resp.status_code}")
+            print(resp.text)
+            break
+        data = resp.json()
+
+        batch = data.get("data", [])
+        fetched += len(batch)
+        progress.update(task, advance=len(batch))
+        yield batch
+
+        next_cursor = (data.get("meta") or {}).get("next_cursor")
+        if next_cursor or cursor:
+            # Cursor paging ends when the server stops returning a cursor
+            if not next_cursor:
+                break
+            cursor = next_cursor
+            continue
+
+        if len(batch) < limit:
+            break
+        offset += limit
+
+    # Fetch finished: settle the task's total so its spinner stops
+    progress.update(task, total=fetched)
@@ -1,54 +1,132 @@
 from mcp.server.fastmcp import FastMCP
 import os
-import requests
-from dotenv import load_dotenv
-from typing import Dict, Any, List, Optional
+import json
+import time
+import asyncio
+import httpx
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from attio_common import load_env, make_client, attio_request
 
 # Load environment variables
-load_dotenv(os.path.join(os.path.dirname(__file__), "crm_migration", ".env"))
+load_env(os.path.join(os.path.dirname(__file__), "crm_migration", ".env"))
 
 ATTIO_API_TOKEN = os.getenv("ATTIO_API_TOKEN")
-API_BASE_URL = "https://api.attio.com/v2"
 
 if not ATTIO_API_TOKEN:
     raise ValueError("ATTIO_API_TOKEN not found in environment variables")
 
-# Initialize FastMCP server
-mcp = FastMCP("attio-server")
+# Shared async client: concurrent tool calls multiplex over one HTTP/2 connection.
+CLIENT = make_client(
+    ATTIO_API_TOKEN,
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
 
-def get_headers() -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {ATTIO_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
+class TTLCache:
+    """Small in-process cache whose entries expire after `ttl` seconds.
+
+    Expired entries are kept (until evicted by size) so callers can fall back
+    to the last good value when Attio returns a 5xx.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value if it is still fresh."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def get_stale(self, key: Any) -> Optional[Any]:
+        """Return the cached value even if it has expired."""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key: Any, value: Any, latency: float = 0.0):
+        """Store a value; slow responses get up to 5s of extra lifetime."""
+        self._entries[key] = (time.monotonic() + self.ttl + min(latency, 5.0), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+# Last ETag and body per path, so expired TTL entries can be revalidated with a 304.
+ETAG_CACHE: Dict[str, Tuple[str, bytes]] = {}
+ETAG_CACHE_MAXSIZE = 1024
+
+async def conditional_get(path: str) -> httpx.Response:
+    """GET with If-None-Match, expanding a 304 back into the cached 200 body."""
+    cached = ETAG_CACHE.get(path)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    response = await attio_request(CLIENT, "GET", path, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        return httpx.Response(200, content=cached[1], headers={"ETag": cached[0]}, request=response.request)
+    
+    etag = response.headers.get("ETag")
+    if response.status_code == 200 and etag:
+        ETAG_CACHE.pop(path, None)
+        ETAG_CACHE[path] = (etag, response.content)
+        if len(ETAG_CACHE) > ETAG_CACHE_MAXSIZE:
+            ETAG_CACHE.pop(next(iter(ETAG_CACHE)))
+    return response
+
+# Object schemas barely change; records are refreshed more often.
+OBJECTS_CACHE = TTLCache(maxsize=8, ttl=60)
+RECORD_CACHE = TTLCache(maxsize=1024, ttl=15)
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the shared HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        await CLIENT.aclose()
+
+# Initialize FastMCP server
+mcp = FastMCP("attio-server", lifespan=lifespan)
 
 @mcp.tool()
-def attio_list_objects() -> str:
+async def attio_list_objects() -> str:
     """List all available objects in the Attio workspace."""
-    url = f"{API_BASE_URL}/objects"
-    response = requests.get(url, headers=get_headers())
+    cached = OBJECTS_CACHE.get("objects")
+    if cached is not None:
+        return cached
+    
+    started = time.monotonic()
+    response = await conditional_get("/objects")
+    if response.is_server_error:
+        stale = OBJECTS_CACHE.get_stale("objects")
+        if stale is not None:
+            return stale
     response.raise_for_status()
     data = response.json()
     
-    # Format output
+    # Format output in one join rather than repeated string concatenation
     objects = data.get("data", [])
-    output = "Available Attio Objects:\n"
-    for obj in objects:
-        output += f"- {obj['api_slug']} (ID: {obj['id']['object_id']})\n"
+    output = "Available Attio Objects:\n" + "".join(
+        f"- {obj['api_slug']} (ID: {obj['id']['object_id']})\n" for obj in objects
+    )
+    
+    OBJECTS_CACHE.set("objects", output, time.monotonic() - started)
     return output
 
-@mcp.tool()
-def attio_create_person(
-    full_name: str, 
-    email: str, 
-    job_title: Optional[str] = None, 
-    company: Optional[str] = None,
+def build_person_payload(
+    full_name: str,
+    email: str,
+    job_title: Optional[str] = None,
     linkedin: Optional[str] = None
-) -> str:
-    """Create a new person record in Attio."""
-    url = f"{API_BASE_URL}/objects/people/records"
-    
-    # Construct payload
+) -> bytes:
+    """Build the encoded Attio people payload shared by the single and bulk tools.
+
+    The body is serialized once here, so retries in attio_request resend the
+    same bytes instead of re-encoding the dict on every attempt.
+    """
     values = {
         "name": [{"full_name": full_name}],
         "email_addresses": [{"email_address": email}]
@@ -62,15 +140,31 @@ def attio_create_person(
         
     # Note: Company is a relationship link, requires ID lookup, skipping for simple version
     
-    payload = {"data": {"values": values}}
-    
-    # Use PUT for upsert logic (match on email)
-    response = requests.put(
-        url, 
-        headers=get_headers(), 
-        json=payload, 
+    return json.dumps({"data": {"values": values}}, separators=(",", ":")).encode()
+
+async def upsert_person(payload: bytes) -> httpx.Response:
+    """PUT an encoded person payload, matching existing records on email."""
+    return await attio_request(
+        CLIENT,
+        "PUT",
+        "/objects/people/records", 
+        content=payload, 
         params={"matching_attribute": "email_addresses"}
     )
+
+@mcp.tool()
+async def attio_create_person(
+    full_name: str, 
+    email: str, 
+    job_title: Optional[str] = None, 
+    company: Optional[str] = None,
+    linkedin: Optional[str] = None
+) -> str:
+    """Create a new person record in Attio."""
+    payload = build_person_payload(full_name, email, job_title, linkedin)
+    
+    # Use PUT for upsert logic (match on email)
+    response = await upsert_person(payload)
     
     if response.status_code not in [200, 201]:
         return f"Error creating person: {response.text}"
@@ -79,16 +173,72 @@ def attio_create_person(
     record_id = data.get("data", {}).get("id", {}).get("record_id", "unknown")
     return f"Successfully created/updated person: {full_name} (ID: {record_id})"
 
+# Upper bound on in-flight PUTs from a single bulk call.
+BULK_CONCURRENCY = 10
+
 @mcp.tool()
-def attio_get_record(object_slug: str, record_id: str) -> str:
+async def attio_create_people_bulk(people: List[Dict[str, Any]]) -> str:
+    """Create or update many person records in Attio concurrently.
+
+    Each entry accepts the same fields as attio_create_person:
+    full_name, email, and optionally job_title and linkedin.
+    """
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+    
+    async def create_one(person: Dict[str, Any]) -> str:
+        full_name = person.get("full_name")
+        email = person.get("email")
+        if not full_name or not email:
+            raise ValueError("full_name and email are required")
+        
+        payload = build_person_payload(full_name, email, person.get("job_title"), person.get("linkedin"))
+        async with semaphore:
+            response = await upsert_person(payload)
+        
+        if response.status_code not in [200, 201]:
+            raise ValueError(response.text)
+        return response.json().get("data", {}).get("id", {}).get("record_id", "unknown")
+    
+    # PUT with matching_attribute is idempotent, so concurrent upserts are safe.
+    results = await asyncio.gather(*(create_one(p) for p in people), return_exceptions=True)
+    
+    succeeded = []
+    failed = []
+    for person, result in zip(people, results):
+        label = person.get("email") or person.get("full_name") or "unknown"
+        if isinstance(result, Exception):
+            failed.append(f"- {label}: {result}")
+        else:
+            succeeded.append(f"- {label} (ID: {result})")
+    
+    output = f"Created/updated {len(succeeded)} of {len(people)} people.\n"
+    if succeeded:
+        output += "Succeeded:\n" + "\n".join(succeeded) + "\n"
+    if failed:
+        output += "Failed:\n" + "\n".join(failed) + "\n"
+    return output
+
+@mcp.tool()
+async def attio_get_record(object_slug: str, record_id: str) -> str:
     """Get details of a specific record."""
-    url = f"{API_BASE_URL}/objects/{object_slug}/records/{record_id}"
-    response = requests.get(url, headers=get_headers())
+    key = (object_slug, record_id)
+    cached = RECORD_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    started = time.monotonic()
+    response = await conditional_get(f"/objects/{object_slug}/records/{record_id}")
     
     if response.status_code != 200:
+        stale = RECORD_CACHE.get_stale(key) if response.is_server_error else None
+        if stale is not None:
+            return stale
         return f"Error fetching record: {response.text}"
-        
-    return str(response.json())
+    
+    # Attio already returns JSON; pass it through instead of parsing and repr()-ing it.
+    output = response.text
+    RECORD_CACHE.set(key, output, time.monotonic() - started)
+    return output
 
 if __name__ == "__main__":
     mcp.run()
@@ -10,14 +10,19 @@ for the migration with all the interactive CLI, logging, and progress tracking f
 
 import os
 import sys
+import csv
 import json
+import random
+import re
 import time
+import asyncio
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from dotenv import load_dotenv
-import pandas as pd
 import requests
 from rich.console import Console
 from rich.table import Table
@@ -42,11 +47,21 @@ ATTIO_DASHBOARD_URL = os.getenv("ATTIO_DASHBOARD_URL", "https://app.attio.com")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", 50))
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 30))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+MIGRATION_CONCURRENCY = int(os.getenv("MIGRATION_CONCURRENCY", 8))
+
+# HTTP statuses worth retrying (timeouts, rate limits, transient server errors)
+RETRYABLE_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
 
 # Log directory setup
 LOG_DIR = Path(__file__).parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+# Extracts the handle from twitter.com / x.com profile URLs
+_X_HANDLE_RE = re.compile(r"(?:twitter\.com|x\.com)/([A-Za-z0-9_]+)", re.IGNORECASE)
+
+# Log files are written through a 1 MiB buffer and never flushed per row
+LOG_BUFFER_SIZE = 1 << 20
+
 
 class MigrationLogger:
     """Handles all logging for the migration process with timestamped files."""
@@ -66,48 +81,59 @@ class MigrationLogger:
         self.error_count = 0
         self.skipped_count = 0
         
-        # Lists to accumulate records
-        self.successful_records = []
-        self.failed_records = []
+        # CSV handles are opened on the first row, so rows stream to disk
+        # instead of accumulating in memory for the whole run
+        self._success_fh = None
+        self._success_writer = None
+        self._error_fh = None
+        self._error_writer = None
         
         console.print(f"[dim]📁 Logs will be saved to: {LOG_DIR}[/dim]")
     
     def log_success(self, twenty_id: str, attio_id: str, record_data: Dict):
         """Log a successfully migrated record."""
         self.success_count += 1
-        self.successful_records.append({
-            "twenty_id": twenty_id,
-            "attio_id": attio_id,
-            "timestamp": datetime.now().isoformat(),
-            **record_data
-        })
+        if self._success_writer is None:
+            self._success_fh, self._success_writer = self._open_log(self.success_log, "attio_id")
+        self._success_writer.writerow((twenty_id, attio_id, datetime.now().isoformat(), record_data.get("values", "")))
     
     def log_error(self, twenty_id: str, error_message: str, record_data: Dict):
         """Log a failed record migration."""
         self.error_count += 1
-        self.failed_records.append({
-            "twenty_id": twenty_id,
-            "error": error_message,
-            "timestamp": datetime.now().isoformat(),
-            **record_data
-        })
+        if self._error_writer is None:
+            self._error_fh, self._error_writer = self._open_log(self.error_log, "error")
+        self._error_writer.writerow((twenty_id, error_message, datetime.now().isoformat(), record_data.get("values", "")))
     
     def log_skip(self, reason: str):
         """Log a skipped record."""
         self.skipped_count += 1
     
+    @staticmethod
+    def _open_log(path: Path, result_column: str):
+        """Open a buffered CSV log and write its header row."""
+        fh = open(path, "w", newline="", buffering=LOG_BUFFER_SIZE)
+        # Plain csv.writer on tuples skips DictWriter's per-row key lookups;
+        # record_data is always a {"values": {...}} payload, so the columns are fixed
+        writer = csv.writer(fh)
+        writer.writerow(("twenty_id", result_column, "timestamp", "values"))
+        return fh, writer
+    
+    @staticmethod
+    def _close_log(fh):
+        """Flush a buffered log handle, sync it to disk once, and close it."""
+        fh.flush()
+        os.fsync(fh.fileno())
+        fh.close()
+    
     def save_logs(self, config: Dict, start_time: datetime, end_time: datetime):
         """Save all accumulated logs to files."""
-        # Save successful migrations to CSV
-        if self.successful_records:
-            df_success = pd.DataFrame(self.successful_records)
-            df_success.to_csv(self.success_log, index=False)
+        # Close the streamed CSV logs; this is the only flush for the whole run
+        if self._success_fh:
+            self._close_log(self._success_fh)
             console.print(f"[green]✓[/green] Success log saved: {self.success_log}")
         
-        # Save failed migrations to CSV
-        if self.failed_records:
-            df_errors = pd.DataFrame(self.failed_records)
-            df_errors.to_csv(self.error_log, index=False)
+        if self._error_fh:
+            self._close_log(self._error_fh)
             console.print(f"[red]✗[/red] Error log saved: {self.error_log}")
         
         # Save summary to text file
@@ -142,14 +168,14 @@ Mapping Log: {self.mapping_log}
 """
         
         # Write summary to file
-        with open(self.summary_log, "w") as f:
+        with open(self.summary_log, "w", buffering=LOG_BUFFER_SIZE) as f:
             f.write(summary)
         
         console.print(f"[blue]ℹ[/blue] Summary saved: {self.summary_log}")
     
     def save_mapping(self, mapping: Dict):
         """Save field mapping configuration to JSON."""
-        with open(self.mapping_log, "w") as f:
+        with open(self.mapping_log, "w", buffering=LOG_BUFFER_SIZE) as f:
             json.dump(mapping, f, indent=2)
         console.print(f"[blue]ℹ[/blue] Field mapping saved: {self.mapping_log}")
 
@@ -157,44 +183,78 @@ Mapping Log: {self.mapping_log}
 class APIClient:
     """Handles API communication with retry logic and error handling."""
     
-    def __init__(self, base_url: str, headers: Dict, name: str):
+    def __init__(self, base_url: str, headers: Dict, name: str, pool_size: int = MIGRATION_CONCURRENCY):
         # Store API configuration
         self.base_url = base_url.rstrip('/')
         self.headers = headers
         self.name = name
         self.session = requests.Session()
         self.session.headers.update(headers)
+        
+        # Size the connection pool for `pool_size` concurrent writes so keep-alive
+        # connections are reused instead of re-handshaking; retries are handled in request()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=max(64, pool_size),
+            max_retries=0
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
-    def request(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
-        """Make an API request with retry logic."""
+    def request(self, method: str, endpoint: str, retry: bool = True, **kwargs) -> Optional[requests.Response]:
+        """Make an API request with retry logic.
+        
+        Pass retry=False for non-idempotent writes, where a timeout or 5xx may
+        mean the server already applied the request.
+        """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         # Add timeout if not specified
         if 'timeout' not in kwargs:
             kwargs['timeout'] = REQUEST_TIMEOUT
         
+        # Encode a JSON body once up front so retries resend the same bytes
+        # (both clients already send Content-Type: application/json)
+        if 'json' in kwargs:
+            kwargs['data'] = json.dumps(kwargs.pop('json')).encode()
+        
         # Retry loop with exponential backoff
-        for attempt in range(MAX_RETRIES):
+        attempts = MAX_RETRIES if retry else 1
+        for attempt in range(attempts):
             try:
                 response = self.session.request(method, url, **kwargs)
                 response.raise_for_status()
                 return response
             
             except requests.exceptions.HTTPError as e:
-                if attempt == MAX_RETRIES - 1:
+                status = e.response.status_code if e.response is not None else None
+                # Validation errors and other permanent failures won't succeed on retry
+                if attempt == attempts - 1 or status not in RETRYABLE_STATUSES:
                     console.print(f"[red]HTTP error for {self.name}: {e}[/red]")
                     raise
-                # Wait before retrying (exponential backoff)
-                time.sleep(2 ** attempt)
+                time.sleep(self._backoff(attempt, e.response))
             
             except requests.exceptions.RequestException as e:
-                if attempt == MAX_RETRIES - 1:
+                if attempt == attempts - 1:
                     console.print(f"[red]Request error for {self.name}: {e}[/red]")
                     raise
-                time.sleep(2 ** attempt)
+                time.sleep(self._backoff(attempt))
         
         return None
     
+    @staticmethod
+    def _backoff(attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Exponential backoff with jitter, never shorter than the server's Retry-After."""
+        retry_after = 0.0
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 0))
+            except (TypeError, ValueError):
+                # HTTP-date form or garbage; fall back to exponential backoff
+                pass
+        # Jitter spreads retries from concurrent writers so they don't stampede together
+        return max(retry_after, 2 ** attempt) + random.uniform(0, 0.5 * 2 ** attempt)
+    
     def get(self, endpoint: str, **kwargs) -> Optional[Dict]:
         """Make a GET request and return JSON."""
         response = self.request("GET", endpoint, **kwargs)
@@ -249,8 +309,11 @@ def check_configuration() -> bool:
     return True
 
 
-def test_connections() -> Tuple[Optional[APIClient], Optional[APIClient]]:
-    """Test connections to both CRMs and return API clients."""
+def test_connections(concurrency: int = MIGRATION_CONCURRENCY) -> Tuple[Optional[APIClient], Optional[APIClient]]:
+    """Test connections to both CRMs and return API clients.
+    
+    The Attio client's connection pool is sized for `concurrency` parallel writes.
+    """
     console.print(Panel("[bold cyan]Testing API Connections[/bold cyan]", expand=False))
     
     twenty_client = None
@@ -281,7 +344,7 @@ def test_connections() -> Tuple[Optional[APIClient], Optional[APIClient]]:
                 "Authorization": f"Bearer {ATTIO_API_TOKEN}",
                 "Content-Type": "application/json"
             }
-            attio_client = APIClient("https://api.attio.com/v2", attio_headers, "Attio CRM")
+            attio_client = APIClient("https://api.attio.com/v2", attio_headers, "Attio CRM", pool_size=concurrency)
             
             # TODO: Test with actual endpoint like /objects
             # For now, just create the client
@@ -320,9 +383,9 @@ def display_migration_summary(logger: MigrationLogger, start_time: datetime):
     
     # Display log file locations
     console.print(Panel("[bold cyan]Migration Logs[/bold cyan]", expand=False))
-    if logger.successful_records:
+    if logger.success_count:
         console.print(f"[green]✓[/green] Success log: {logger.success_log}")
-    if logger.failed_records:
+    if logger.error_count:
         console.print(f"[red]✗[/red] Error log: {logger.error_log}")
     console.print(f"[blue]ℹ[/blue] Summary: {logger.summary_log}")
     console.print()
@@ -345,57 +408,65 @@ def fetch_available_objects(client: APIClient) -> List[str]:
         return ["people", "companies", "opportunities", "tasks"]
 
 
+def iter_records(client: APIClient, object_name: str) -> Iterator[List[Dict]]:
+    """Yield flattened pages of records for a specific object from Twenty CRM."""
+    cursor = None
+    
+    while True:
+        # Construct URL with pagination
+        # Adjust endpoint based on Twenty's actual API structure
+        endpoint = f"/rest/{object_name}"
+        params = {"limit": BATCH_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        
+        response = client.get(endpoint, params=params)
+        
+        if not response or 'data' not in response:
+            break
+            
+        # Handle nested response structure: {"data": {"people": [...]}}
+        data = response.get('data', {})
+        if isinstance(data, list):
+            batch = data
+        elif isinstance(data, dict):
+            # Try to get the list using the object name
+            batch = data.get(object_name, [])
+        else:
+            batch = []
+        
+        if not batch:
+            break
+            
+        # Flatten records immediately
+        yield list(map(flatten_record, batch))
+        
+        # Check for pagination cursor
+        # Adjust based on actual response structure
+        meta = response.get('meta', {})
+        cursor = meta.get('next_cursor')
+        
+        if not cursor:
+            break
+
+
 def extract_records(client: APIClient, object_name: str) -> List[Dict]:
     """Extract all records for a specific object from Twenty CRM."""
     records = []
-    cursor = None
-    page = 1
     
     with console.status(f"[bold green]Extracting {object_name} records...[/bold green]") as status:
-        while True:
-            # Construct URL with pagination
-            # Adjust endpoint based on Twenty's actual API structure
-            endpoint = f"/rest/{object_name}"
-            params = {"limit": BATCH_SIZE}
-            if cursor:
-                params["cursor"] = cursor
-            
-            status.update(f"Fetching page {page}...")
-            response = client.get(endpoint, params=params)
-            
-            if not response or 'data' not in response:
-                break
-                
-            # Handle nested response structure: {"data": {"people": [...]}}
-            data = response.get('data', {})
-            if isinstance(data, list):
-                batch = data
-            elif isinstance(data, dict):
-                # Try to get the list using the object name
-                batch = data.get(object_name, [])
-            else:
-                batch = []
-            
-            if not batch:
-                break
-                
-            # Flatten records immediately
-            flat_batch = [flatten_record(r) for r in batch]
-            records.extend(flat_batch)
-            
-            # Check for pagination cursor
-            # Adjust based on actual response structure
-            meta = response.get('meta', {})
-            cursor = meta.get('next_cursor')
-            
-            if not cursor:
-                break
-                
-            page += 1
+        status.update("Fetching page 1...")
+        for page, batch in enumerate(iter_records(client, object_name), start=1):
+            records.extend(batch)
+            status.update(f"Fetching page {page + 1}...")
             
     return records
 
 
+# Twenty system fields that are never offered for interactive mapping
+_SKIP_FIELDS = frozenset({'id', 'createdAt', 'updatedAt', 'deletedAt', 'position', 'searchVector'})
+
+
 def configure_field_mapping(source_records: List[Dict], target_object: str) -> Dict[str, str]:
     """Auto-configure field mapping based on known schemas."""
     if not source_records:
@@ -414,13 +485,13 @@ def configure_field_mapping(source_records: List[Dict], target_object: str) -> D
         }
         
     # Fallback to interactive for unknown objects
-    source_fields = list(source_records[0].keys())
+    source_fields = source_records[0].keys()
     mapping = {}
     
     console.print(Panel(f"[bold]Map fields from Twenty ({len(source_fields)} fields) to Attio ({target_object})[/bold]", expand=False))
     
     for field in source_fields:
-        if field in ['id', 'createdAt', 'updatedAt', 'deletedAt', 'position', 'searchVector']:
+        if field in _SKIP_FIELDS:
             continue
             
         target_field = Prompt.ask(f"Map Twenty field [cyan]{field}[/cyan] to Attio field", default=field)
@@ -430,8 +501,13 @@ def configure_field_mapping(source_records: List[Dict], target_object: str) -> D
     return mapping
 
 def flatten_record(record: Dict) -> Dict:
-    """Flatten complex Twenty CRM fields into simple values."""
-    flat = record.copy()
+    """Flatten complex Twenty CRM fields into simple values.
+    
+    The derived keys are added to `record` in place and it is returned; records
+    come straight from a parsed API page, so copying them first only cost memory.
+    All source fields are kept because interactive mappings can reference any of them.
+    """
+    flat = record
     
     # Flatten Name
     name = record.get('name', {})
@@ -460,26 +536,15 @@ def flatten_record(record: Dict) -> Dict:
         # Let's try to extract just the handle part if it looks like a URL.
         
         if x_url:
-            # Handle complex URLs or invalid formats like "http://twitter.com/Cat5BoatShoes.com"
-            # Attio strictly validates handles. "Cat5BoatShoes.com" is invalid because of the dot?
-            # Or maybe it just expects the handle.
-            
-            # 1. Clean URL parts
+            # Handle complex URLs or invalid formats like "http://twitter.com/Cat5BoatShoes.com".
+            # Twitter handles are alphanumeric + underscore only, so the regex stops at the
+            # first other character (the ".com" above, a query string, a trailing path).
             cleaned = x_url.strip()
-            if "twitter.com/" in cleaned or "x.com/" in cleaned:
-                try:
-                    cleaned = cleaned.rstrip('/').split('/')[-1]
-                    cleaned = cleaned.split('?')[0]
-                except:
-                    pass
-            
-            # 2. Strict validation: Handle should usually be alphanumeric + underscore
-            # If it contains a dot, it might be invalid for Attio (though Twitter allows dots in some contexts? No, actually Twitter handles are alphanumeric and underscore only, 15 chars max).
-            # "Cat5BoatShoes.com" has a dot. It's likely an invalid handle in the source data.
-            # If we detect a dot or other invalid chars, we might want to just NOT send it, or try to clean it further.
-            
-            # Simple heuristic: if it has a dot, take the part before the dot
-            if '.' in cleaned:
+            match = _X_HANDLE_RE.search(cleaned)
+            if match:
+                cleaned = match.group(1)
+            elif '.' in cleaned:
+                # Simple heuristic for bare values: if it has a dot, take the part before the dot
                 cleaned = cleaned.split('.')[0]
                 
             x_url = cleaned
@@ -489,6 +554,24 @@ def flatten_record(record: Dict) -> Dict:
     return flat
 
 
+def parse_selection(answer: str, count: int) -> List[int]:
+    """Turn a 1-based selection like "1-5,8" into sorted 0-based indices.
+    
+    A blank answer selects everything; out-of-range or malformed parts are ignored.
+    """
+    if not answer.strip():
+        return list(range(count))
+    selected = set()
+    for part in answer.split(','):
+        start, _, end = part.strip().partition('-')
+        try:
+            first, last = int(start), int(end or start)
+        except ValueError:
+            continue
+        selected.update(range(max(first, 1) - 1, min(last, count)))
+    return sorted(selected)
+
+
 def select_records_to_migrate(records: List[Dict]) -> List[Dict]:
     """Interactive record selection."""
     console.print(f"\n[bold]Found {len(records)} records.[/bold]")
@@ -506,29 +589,368 @@ def select_records_to_migrate(records: List[Dict]) -> List[Dict]:
         field = Prompt.ask("Filter by field", choices=fields)
         value = Prompt.ask(f"Value for {field} (exact match)")
         
-        filtered = [r for r in records if str(r.get(field)) == value]
+        # Compare strings directly; only non-string values need str() coercion
+        filtered = [
+            r for r in records
+            if (v := r.get(field)) == value or (not isinstance(v, str) and str(v) == value)
+        ]
         console.print(f"Filtered to {len(filtered)} records.")
         return filtered
         
     elif choice == "Manual Selection (First 50)":
-        # Simple manual selection for demo
-        selected = []
-        for i, record in enumerate(records[:50]):
-            label = record.get('name') or record.get('email') or record.get('id')
-            if Confirm.ask(f"Migrate record {i+1}: {label}?", default=True):
-                selected.append(record)
-        return selected
+        # List the candidates in one render and take a single answer,
+        # rather than a confirmation round-trip per record
+        candidates = records[:50]
+        console.print("\n".join(
+            f"  {i}. {record.get('name') or record.get('email') or record.get('id')}"
+            for i, record in enumerate(candidates, 1)
+        ))
+        answer = Prompt.ask("Records to migrate (e.g. 1-5,8; blank for all)", default="")
+        return [candidates[i] for i in parse_selection(answer, len(candidates))]
         
     return records
 
 
+def _h_name(value) -> List[Dict]:
+    """Personal-name attribute."""
+    # Attio Personal Name attribute expects 'full_name'
+    # Error message says: "validation_errors":[{"code":"invalid_type","path":["full_name"],"message":"Required"}]
+    # So we MUST provide full_name; first_name/last_name are sent alongside it.
+    parts = str(value).split(' ', 1)
+    return [{
+        "full_name": value,
+        "first_name": parts[0],
+        "last_name": parts[1] if len(parts) > 1 else ""
+    }]
+
+
+def _h_email(value) -> List[Dict]:
+    """Email-address attribute; Attio expects the email_address key."""
+    return [{"email_address": value}]
+
+
+# Attio Location type expects specific keys like 'locality' (city), 'country_code', etc.
+# Empty strings for optional fields are NOT allowed for country_code (must be ISO or null)
+# Lat/Long must be valid or null
+# line_3/line_4 are also required keys
+_LOCATION_TEMPLATE = {
+    "line_1": "",
+    "line_2": "",
+    "line_3": "",
+    "line_4": "",
+    "locality": "",
+    "region": "",
+    "postcode": "",
+    "country_code": None, 
+    "latitude": None,
+    "longitude": None
+}
+
+
+def _h_location(value) -> List[Dict]:
+    """Location attribute (primary_location); the city maps to locality."""
+    location = _LOCATION_TEMPLATE.copy()
+    location["locality"] = value
+    return [location]
+
+
+def _h_social(value) -> List[Dict]:
+    """Social/URL attributes; based on API responses linkedin/twitter are type 'text'."""
+    return [{"value": value}]
+
+
+def _h_text(value):
+    """Default fallback for text fields; non-strings are passed through untouched."""
+    return [{"value": value}] if isinstance(value, str) else value
+
+
+# Attio attribute handlers keyed by target field; anything else is social or text
+_HANDLERS = {
+    "name": _h_name,
+    "email_addresses": _h_email,
+    "primary_location": _h_location,
+}
+_SOCIAL_FIELDS = frozenset(["linkedin", "twitter", "facebook", "instagram", "angellist"])
+
+
+# Attio attribute types with a structured value shape; used when the target schema is known
+_TYPE_HANDLERS = {
+    "personal-name": _h_name,
+    "email-address": _h_email,
+    "location": _h_location,
+}
+
+
+def fetch_target_attributes(attio_client: APIClient, target_object: str) -> Dict[str, Dict]:
+    """Fetch the target object's attribute schema once, keyed by api_slug.
+    
+    Returns an empty dict if the schema can't be read; mapping then falls back
+    to the slug-based handler rules.
+    """
+    try:
+        response = attio_client.get(f"/objects/{target_object}/attributes")
+    except requests.exceptions.RequestException:
+        console.print(f"[dim]Could not read the {target_object} attribute schema; using default field handling[/dim]")
+        return {}
+    return {attr['api_slug']: attr for attr in (response or {}).get('data', []) if attr.get('api_slug')}
+
+
+def compile_mapping(mapping: Dict, schema: Optional[Dict[str, Dict]] = None) -> List[Tuple[str, str, Any]]:
+    """Resolve each mapped field's handler once, ahead of the per-record loop.
+    
+    With the target `schema`, handlers follow the attribute's declared type, so
+    e.g. a renamed email attribute gets the email shape and a text `name` on
+    companies stays plain text. The slug rules apply only to attributes the
+    schema doesn't list.
+    """
+    schema = schema or {}
+    compiled = []
+    for source_field, target_field in mapping.items():
+        fallback = _h_social if target_field in _SOCIAL_FIELDS else _h_text
+        if target_field in schema:
+            handler = _TYPE_HANDLERS.get(schema[target_field].get('type'), fallback)
+        else:
+            handler = _HANDLERS.get(target_field, fallback)
+        compiled.append((source_field, target_field, handler))
+    return compiled
+
+
+def build_payload(record: Dict, compiled_mapping: List[Tuple[str, str, Any]]) -> Dict:
+    """Convert a flattened Twenty record into an Attio `{"values": ...}` payload."""
+    values = {}
+    for source_field, target_field, handler in compiled_mapping:
+        value = record.get(source_field)
+        if value is not None and value != "":
+            values[target_field] = handler(value)
+    return {"values": values}
+
+
+def push_record(attio_client: APIClient, payload: Dict, target_object: str) -> Optional[str]:
+    """Write one payload to Attio and return the created/updated record ID."""
+    # Endpoint: POST /v2/objects/{object}/records
+    endpoint = f"/objects/{target_object}/records"
+    
+    # Attio v2 supports `PUT /v2/objects/{object}/records?matching_attribute=email_addresses`
+    # for upserts, so people with an email are asserted instead of blindly created.
+    if uses_upsert(payload, target_object):
+        response = attio_client.request("PUT", endpoint, json={"data": payload}, params={"matching_attribute": "email_addresses"})
+        if response is None:
+            raise RuntimeError("No response or empty response")
+        try:
+            resp_data = response.json()
+        except ValueError:
+            # Status is OK but the body is not JSON
+            return "upserted-no-content"
+    else:
+        # Fallback to POST if no email (cannot check uniqueness on email)
+        resp_data = attio_client.post(endpoint, {"data": payload})
+        if not resp_data:
+            raise RuntimeError("No response or empty response")
+    
+    if 'data' in resp_data:
+        return resp_data['data'].get('id', {}).get('record_id')
+    # Attio usually returns the record; tolerate successful writes without a data key.
+    return "upserted"
+
+
+def uses_upsert(payload: Dict, target_object: str) -> bool:
+    """People with an email are asserted via PUT rather than created."""
+    return target_object == 'people' and bool(payload["values"].get("email_addresses"))
+
+
+def format_error(e: Exception) -> str:
+    """Render an exception for the error log, including any API response body."""
+    error_msg = str(e)
+    if hasattr(e, 'response') and e.response is not None:
+        try:
+            # Append the response text to the error message for better debugging
+            error_msg += f" | Response: {e.response.text}"
+        except:
+            pass
+    return error_msg
+
+
+def push_chunk(
+    attio_client: APIClient,
+    items: List[Tuple[str, Dict]],
+    target_object: str,
+    bulk_state: Dict
+) -> List[Tuple[str, Dict, Optional[str], Optional[str]]]:
+    """Write a chunk of (twenty_id, payload) items to Attio.
+    
+    Plain creates are sent in one request to the bulk endpoint; upserts, single
+    records, and any chunk the bulk endpoint definitely rejected (400/413, or
+    404/405 when the endpoint doesn't exist) fall back to one request per record.
+    When the bulk outcome is unknown (timeout, 5xx, unexpected body) the creates
+    are logged as errors rather than re-sent, since Attio may already hold them.
+    Returns (twenty_id, payload, attio_id, error) for every item.
+    """
+    creates, upserts = [], []
+    for item in items:
+        (upserts if uses_upsert(item[1], target_object) else creates).append(item)
+    
+    if not (bulk_state["enabled"] and len(creates) > 1):
+        return push_singles(attio_client, items, target_object)
+    
+    try:
+        # Encode each payload on its own and splice the bytes into the
+        # envelope, so the outer {"data": [...]} never goes through json.dumps
+        body = b'{"data":[' + b",".join(json.dumps(payload).encode() for _, payload in creates) + b"]}"
+        # Sent exactly once: a retried timeout or 5xx could create the batch twice
+        response = attio_client.request("POST", f"/objects/{target_object}/records/bulk", retry=False, data=body)
+        parsed = response.json() if response is not None else None
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if status in (404, 405):
+            # Endpoint not available in this workspace; stop trying it for this run.
+            bulk_state["enabled"] = False
+            console.print("[dim]Bulk endpoint unavailable, using per-record writes[/dim]")
+            return push_singles(attio_client, items, target_object)
+        if status in (400, 413):
+            # Bad or oversized batch: nothing was written, so retry record by record
+            return push_singles(attio_client, items, target_object)
+        return _unknown_outcome(creates, format_error(e)) + push_singles(attio_client, upserts, target_object)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # Timeout or unreadable body: the server may have committed the batch
+        return _unknown_outcome(creates, format_error(e)) + push_singles(attio_client, upserts, target_object)
+    
+    created = parsed.get("data") if isinstance(parsed, dict) else None
+    if not (isinstance(created, list) and len(created) == len(creates)):
+        return _unknown_outcome(creates, "Unexpected bulk response body") + push_singles(attio_client, upserts, target_object)
+    
+    # Map the returned array back to source IDs by position
+    results = [
+        (twenty_id, payload, _record_id(rec), None)
+        for (twenty_id, payload), rec in zip(creates, created)
+    ]
+    return results + push_singles(attio_client, upserts, target_object)
+
+
+def _record_id(rec) -> Optional[str]:
+    """Pull record_id out of one returned record, tolerating odd shapes."""
+    record_id = rec.get('id') if isinstance(rec, dict) else None
+    return record_id.get('record_id') if isinstance(record_id, dict) else None
+
+
+def _unknown_outcome(
+    items: List[Tuple[str, Dict]],
+    reason: str
+) -> List[Tuple[str, Dict, Optional[str], Optional[str]]]:
+    """Error results for a bulk write that may or may not have been applied."""
+    error = f"Bulk write outcome unknown, not retried (check Attio before re-running): {reason}"
+    return [(twenty_id, payload, None, error) for twenty_id, payload in items]
+
+
+def push_singles(
+    attio_client: APIClient,
+    items: List[Tuple[str, Dict]],
+    target_object: str
+) -> List[Tuple[str, Dict, Optional[str], Optional[str]]]:
+    """Write each (twenty_id, payload) item with its own request."""
+    results = []
+    for twenty_id, payload in items:
+        try:
+            results.append((twenty_id, payload, push_record(attio_client, payload, target_object), None))
+        except Exception as e:
+            results.append((twenty_id, payload, None, format_error(e)))
+    return results
+
+
+def iter_chunks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Group any iterable of records into lists of at most `size`."""
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+async def _execute_migration_async(
+    attio_client: APIClient,
+    records: Iterable[Dict],
+    mapping: Dict,
+    target_object: str,
+    logger: MigrationLogger,
+    dry_run: bool,
+    progress: Progress,
+    task,
+    concurrency: int,
+    schema: Optional[Dict[str, Dict]]
+):
+    """Write records in BATCH_SIZE chunks, at most `concurrency` chunks at a time.
+    
+    `records` may be a lazy iterator over extracted pages: chunks are pulled only
+    when a write slot frees up, so extraction overlaps with upload and at most
+    `concurrency` chunks are held in memory.
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    # Own pool rather than the loop's default executor, which caps at
+    # min(32, cpu_count() + 4) workers: one thread per write slot plus one
+    # for the producer, so extraction never queues behind the writers
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency + 1)
+    bulk_state = {"enabled": True}
+    compiled_mapping = compile_mapping(mapping, schema)
+    
+    async def run(chunk: List[Dict]):
+        try:
+            items = [(record.get('id', 'unknown'), build_payload(record, compiled_mapping)) for record in chunk]
+            
+            if dry_run:
+                results = [(twenty_id, payload, "dry-run-id", None) for twenty_id, payload in items]
+            else:
+                # requests is blocking, so the chunk is written in a worker thread; APIClient's
+                # retry/backoff happens there without stalling the other in-flight chunks.
+                results = await loop.run_in_executor(executor, push_chunk, attio_client, items, target_object, bulk_state)
+        except Exception as e:
+            # Never lose a chunk silently: every record in it lands in the error log,
+            # with the source record in place of the payload that wasn't built or sent
+            error = format_error(e)
+            results = [(record.get('id', 'unknown'), {"values": record}, None, error) for record in chunk]
+        finally:
+            semaphore.release()
+        
+        for twenty_id, payload, attio_id, error in results:
+            if error is None:
+                logger.log_success(twenty_id, attio_id, payload)
+            else:
+                logger.log_error(twenty_id, error, payload)
+        # One progress update per chunk, not per record, keeps Rich redraws cheap
+        progress.advance(task, len(chunk))
+    
+    chunks = iter_chunks(records, BATCH_SIZE)
+    tasks = []
+    try:
+        while True:
+            await semaphore.acquire()
+            try:
+                # Pulling the next chunk may fetch a page from Twenty, so keep it off the loop
+                chunk = await loop.run_in_executor(executor, next, chunks, None)
+            except Exception as e:
+                # A failed page fetch ends extraction, but chunks already in flight still
+                # finish and get logged
+                console.print(f"[red]Extraction stopped early, no further records pulled: {e}[/red]")
+                chunk = None
+            if chunk is None:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(run(chunk)))
+        # One failing chunk must not stop the others from being awaited and logged
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                console.print(f"[red]Chunk failed while logging: {result}[/red]")
+    finally:
+        executor.shutdown(wait=True)
+
+
 def execute_migration(
     attio_client: APIClient, 
-    records: List[Dict], 
+    records: Iterable[Dict], 
     mapping: Dict, 
     target_object: str,
     logger: MigrationLogger,
-    dry_run: bool
+    dry_run: bool,
+    concurrency: int = MIGRATION_CONCURRENCY,
+    schema: Optional[Dict[str, Dict]] = None
 ):
     """Execute the migration with progress tracking."""
     
@@ -541,131 +963,22 @@ def execute_migration(
         console=console
     ) as progress:
         
-        task = progress.add_task(f"[cyan]Migrating to {target_object}...", total=len(records))
+        # Streamed records have no known length up front
+        total = len(records) if hasattr(records, '__len__') else None
+        task = progress.add_task(f"[cyan]Migrating to {target_object}...", total=total)
         
-        for record in records:
-            twenty_id = record.get('id', 'unknown')
-            
-            # Prepare Attio payload
-            payload = {"values": {}}
-            for source_field, target_field in mapping.items():
-                value = record.get(source_field)
-                if value is not None and value != "":
-                    # Handle Name field (personal-name type)
-                    if target_field == "name":
-                        # Attio Personal Name attribute expects 'full_name'
-                        # It can optionally take first_name/last_name but full_name is often required or preferred
-                        # Error message says: "validation_errors":[{"code":"invalid_type","path":["full_name"],"message":"Required"}]
-                        # So we MUST provide full_name.
-                        # We can also provide first_name/last_name if we have them, but full_name is the key.
-                        parts = str(value).split(' ', 1)
-                        first_name = parts[0]
-                        last_name = parts[1] if len(parts) > 1 else ""
-                        
-                        payload["values"][target_field] = [{
-                            "full_name": value,
-                            "first_name": first_name,
-                            "last_name": last_name
-                        }]
-                    
-                    # Handle Email field (email-address type)
-                    elif target_field == "email_addresses":
-                        # Attio expects email_address key
-                        payload["values"][target_field] = [{"email_address": value}]
-                        
-                    # Handle Location field (primary_location)
-                    elif target_field == "primary_location":
-                        # Attio Location type expects specific keys like 'locality' (city), 'country_code', etc.
-                        # Empty strings for optional fields are NOT allowed for country_code (must be ISO or null)
-                        # Lat/Long must be valid or null
-                        # line_3/line_4 are also required keys
-                        payload["values"][target_field] = [{
-                            "line_1": "",
-                            "line_2": "",
-                            "line_3": "",
-                            "line_4": "",
-                            "locality": value, # City maps to locality
-                            "region": "",
-                            "postcode": "",
-                            "country_code": None, 
-                            "latitude": None,
-                            "longitude": None
-                        }]
-
-                    # Handle simple text fields (job_title, city, etc.)
-                    # Attio expects 'value' key for text, 'original_url' for URLs?
-                    # Let's check other types based on common failures
-                    
-                    elif target_field in ["linkedin", "twitter", "facebook", "instagram", "angellist"]:
-                        # For URL/Social fields, Attio often just treats them as text unless specified otherwise
-                        # The error log showed 'value' was sent. 
-                        # If type is text, 'value' is correct.
-                        # If type is domain or url, might be different. 
-                        # Based on API response, linkedin/twitter are type 'text'.
-                        payload["values"][target_field] = [{"value": value}]
-                        
-                    else:
-                        # Default fallback for text fields
-                        payload["values"][target_field] = [{"value": value}] if isinstance(value, str) else value
-            
-            if dry_run:
-                time.sleep(0.1) # Simulate work
-                logger.log_success(twenty_id, "dry-run-id", payload)
-                progress.advance(task)
-                continue
-                
-            # Execute API call
-            try:
-                # Endpoint: POST /v2/objects/{object}/records
-                endpoint = f"/objects/{target_object}/records"
-                
-                # Check for existing record first to handle upserts?
-                # Attio supports upsert via assert_unique but here we just POST.
-                # If we get a 400 uniqueness conflict, we should try to update or look up the existing one.
-                # Or we can use the 'PUT' method with a matching attribute if Attio supports it easily.
-                # Attio v2 supports `PUT /v2/objects/{object}/records?matching_attribute=email_addresses`
-                
-                if target_object == 'people':
-                     # Use PUT for upsert on people based on email
-                     # BUT only if email_addresses is in the payload!
-                     if "email_addresses" in payload["values"] and payload["values"]["email_addresses"]:
-                        response = attio_client.request("PUT", endpoint, json={"data": payload}, params={"matching_attribute": "email_addresses"})
-                     else:
-                        # Fallback to POST if no email (cannot check uniqueness on email)
-                        response = attio_client.post(endpoint, {"data": payload})
-                else:
-                     response = attio_client.post(endpoint, {"data": payload})
-                
-                if response:
-                    # PUT returns 200 OK with data, POST returns 200 OK with data
-                    # Check if response has json content
-                    try:
-                        resp_data = response.json()
-                        if 'data' in resp_data:
-                            attio_id = resp_data['data'].get('id', {}).get('record_id')
-                            logger.log_success(twenty_id, attio_id, payload)
-                        else:
-                            # Some successful PUTs might not return data the same way? 
-                            # But Attio usually returns the record.
-                            # If status is 200/201 but no data key?
-                            logger.log_success(twenty_id, "upserted", payload)
-                    except:
-                        # If response is not JSON but status is OK
-                         logger.log_success(twenty_id, "upserted-no-content", payload)
-                else:
-                    logger.log_error(twenty_id, "No response or empty response", payload)
-                    
-            except Exception as e:
-                error_msg = str(e)
-                if hasattr(e, 'response') and e.response is not None:
-                    try:
-                        # Append the response text to the error message for better debugging
-                        error_msg += f" | Response: {e.response.text}"
-                    except:
-                        pass
-                logger.log_error(twenty_id, error_msg, payload)
-            
-            progress.advance(task)
+        # Overlap network round-trips instead of waiting on one record at a time
+        asyncio.run(_execute_migration_async(
+            attio_client, records, mapping, target_object, logger, dry_run, progress, task, concurrency, schema
+        ))
+
+
+# Demo records offered when extraction comes back empty
+_DUMMY_RECORDS = (
+    {"id": "1", "name": "Alice Smith", "email": "alice@example.com", "company": "Tech Corp"},
+    {"id": "2", "name": "Bob Jones", "email": "bob@example.com", "company": "Sales Inc"},
+    {"id": "3", "name": "Charlie Day", "email": "charlie@example.com", "company": "Media Ltd"},
+)
 
 
 @click.command()
@@ -673,7 +986,9 @@ def execute_migration(
 @click.option('--object', 'object_name', help='Source object to migrate (e.g., people)')
 @click.option('--target', 'target_name', help='Target object in Attio (e.g., people)')
 @click.option('--yes', is_flag=True, help='Skip confirmation prompts')
-def main(dry_run: bool, object_name: Optional[str], target_name: Optional[str], yes: bool):
+@click.option('--concurrency', type=click.IntRange(min=1), default=MIGRATION_CONCURRENCY, show_default=True,
+              help='Batches written to Attio in parallel (overrides MIGRATION_CONCURRENCY)')
+def main(dry_run: bool, object_name: Optional[str], target_name: Optional[str], yes: bool, concurrency: int):
     """
     CRM Migration Tool: Twenty → Attio
     
@@ -704,7 +1019,7 @@ def main(dry_run: bool, object_name: Optional[str], target_name: Optional[str],
     console.print()
     
     # Step 2: Test connections
-    twenty_client, attio_client = test_connections()
+    twenty_client, attio_client = test_connections(concurrency)
     
     if not twenty_client or not attio_client:
         console.print("\n[red]❌ Connection tests failed. Please check your API credentials.[/red]")
@@ -738,44 +1053,59 @@ def main(dry_run: bool, object_name: Optional[str], target_name: Optional[str],
     
     # Step 4: Extract Data
     console.print(Panel(f"[bold yellow]2. Extracting {selected_object}[/bold yellow]", expand=False))
-    records = extract_records(twenty_client, selected_object)
+    if yes:
+        # Non-interactive runs stream: the first page drives the field mapping and the
+        # remaining pages are fetched while earlier ones are already being written.
+        pages = iter_records(twenty_client, selected_object)
+        records = next(pages, [])
+    else:
+        pages = iter(())
+        records = extract_records(twenty_client, selected_object)
     
     if not records:
         # Create dummy records for demonstration if extraction fails/returns empty
         if yes or Confirm.ask("No records found. Generate dummy data for testing?", default=True):
-            records = [
-                {"id": "1", "name": "Alice Smith", "email": "alice@example.com", "company": "Tech Corp"},
-                {"id": "2", "name": "Bob Jones", "email": "bob@example.com", "company": "Sales Inc"},
-                {"id": "3", "name": "Charlie Day", "email": "charlie@example.com", "company": "Media Ltd"},
-            ]
+            # Copies, so nothing downstream can alter the shared constants
+            records = [dict(record) for record in _DUMMY_RECORDS]
         else:
             console.print("[red]Aborting migration.[/red]")
             sys.exit(0)
             
-    console.print(f"[green]✓ Extracted {len(records)} records[/green]")
+    if yes:
+        console.print(f"[green]✓ Extracted first page ({len(records)} records); the rest stream during migration[/green]")
+    else:
+        console.print(f"[green]✓ Extracted {len(records)} records[/green]")
     console.print()
     
     # Step 5: Field Mapping
     console.print(Panel("[bold yellow]3. Field Mapping[/bold yellow]", expand=False))
     mapping = configure_field_mapping(records, target_object)
     logger.save_mapping(mapping)
+    
+    # Resolve the target schema once per run; records are then mapped without lookups
+    schema = fetch_target_attributes(attio_client, target_object)
+    unknown = [field for field in mapping.values() if schema and field not in schema]
+    if unknown:
+        console.print(f"[yellow]⚠ Not attributes of {target_object} in Attio: {', '.join(unknown)}[/yellow]")
     console.print()
     
     # Step 6: Record Selection
     console.print(Panel("[bold yellow]4. Record Selection[/bold yellow]", expand=False))
     if yes:
         console.print("Auto-selecting ALL records.")
-        selected_records = records
+        selected_records = chain(records, chain.from_iterable(pages))
+        selected_count = "ALL"
     else:
         selected_records = select_records_to_migrate(records)
-    console.print(f"[green]✓ Selected {len(selected_records)} records for migration[/green]")
+        selected_count = str(len(selected_records))
+    console.print(f"[green]✓ Selected {selected_count} records for migration[/green]")
     console.print()
     
     # Step 7: Confirmation
     console.print(Panel("[bold yellow]5. Confirmation[/bold yellow]", expand=False))
     console.print(f"Source: [cyan]Twenty CRM ({selected_object})[/cyan]")
     console.print(f"Target: [cyan]Attio CRM ({target_object})[/cyan]")
-    console.print(f"Records: [bold]{len(selected_records)}[/bold]")
+    console.print(f"Records: [bold]{selected_count}[/bold]")
     console.print(f"Mode: [bold]{'DRY RUN (Safe)' if dry_run else 'LIVE MIGRATION'}[/bold]")
     console.print()
     
@@ -786,16 +1116,18 @@ def main(dry_run: bool, object_name: Optional[str], target_name: Optional[str],
     console.print()
     
     # Step 8: Execution
-    execute_migration(attio_client, selected_records, mapping, target_object, logger, dry_run)
-    
-    # Save logs
     config = {
         "twenty_url": TWENTY_BASE_URL,
         "attio_url": ATTIO_DASHBOARD_URL,
         "batch_size": BATCH_SIZE,
         "object": selected_object
     }
-    logger.save_logs(config, start_time, datetime.now())
+    try:
+        execute_migration(attio_client, selected_records, mapping, target_object, logger, dry_run, concurrency, schema)
+    finally:
+        # Records may already exist in Attio, so the buffered logs are written even
+        # if the run is interrupted or fails partway
+        logger.save_logs(config, start_time, datetime.now())
     
     # Display summary
     display_migration_summary(logger, start_time)
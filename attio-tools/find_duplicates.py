@@ -1,10 +1,12 @@
 import os
-import requests
+import asyncio
+import httpx
 import json
-import pandas as pd
 from dotenv import load_dotenv
 from collections import defaultdict
 from pathlib import Path
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from attio_common import make_client, iter_query_pages
 
 # Load env relative to this file so the script keeps working when moved.
 BASE_DIR = Path(__file__).resolve().parent
@@ -12,149 +14,130 @@ ENV_PATH = BASE_DIR / "crm_migration" / ".env"
 load_dotenv(ENV_PATH)
 
 TOKEN = os.getenv("ATTIO_API_TOKEN")
-API_BASE_URL = "https://api.attio.com/v2"
 
-def get_headers():
-    return {
-        "Authorization": f"Bearer {TOKEN}",
-        "Content-Type": "application/json"
-    }
+# One pooled HTTP/2 client for the whole run, so every page reuses the same
+# connection instead of paying a fresh TCP+TLS handshake
+CLIENT = make_client(
+    TOKEN,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30.0
+)
 
-def fetch_all_records(object_slug):
-    print(f"Fetching all {object_slug}...")
-    url = f"{API_BASE_URL}/objects/{object_slug}/records/query"
-    records = []
-    limit = 1000
-    offset = 0
-    
-    # Using specific query structure for Attio V2
-    # It usually supports cursor pagination or offset/limit depending on the endpoint.
-    # The /query endpoint often uses "limit" and "offset" inside the body.
-    
-    while True:
-        payload = {
-            "limit": limit,
-            "offset": offset
-        }
-        
-        try:
-            resp = requests.post(url, headers=get_headers(), json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-            batch = data.get("data", [])
-            records.extend(batch)
-            
-            print(f"  Fetched {len(batch)} records (Total: {len(records)})")
-            
-            if len(batch) < limit:
-                break
-            
-            offset += limit
-            
-        except Exception as e:
-            print(f"Error fetching {object_slug}: {e}")
-            if hasattr(e, 'response') and e.response:
-                print(e.response.text)
-            break
-            
-    return records
-
-def process_people(records):
-    print("\nProcessing People...")
+async def process_people(pages):
     email_map = defaultdict(list)
+    # Groups are registered the moment they get a second record, so there is
+    # no filtering pass over every singleton afterwards
+    duplicates = {}
     
-    for r in records:
-        rid = r['id']['record_id']
-        values = r.get('values', {})
+    async for batch in pages:
+        for r in batch:
+            rid = r['id']['record_id']
+            values = r.get('values') or {}
         
-        # Extract Name
-        full_name = "Unknown"
-        name_vals = values.get('name', [])
-        if name_vals:
-            full_name = name_vals[0].get('full_name', 'Unknown')
+            # Extract Name
+            full_name = "Unknown"
+            name_vals = values.get('name') or ()
+            if name_vals:
+                full_name = name_vals[0].get('full_name', 'Unknown')
             
-        # Extract Emails
-        emails = []
-        email_vals = values.get('email_addresses', [])
-        for e in email_vals:
-            addr = e.get('email_address')
-            if addr:
-                emails.append(addr.lower())
-        
-        for e in emails:
-            email_map[e].append({
+            # Extract Emails, deduplicated (order kept) so a record listing the
+            # same address twice isn't counted as its own duplicate
+            email_vals = values.get('email_addresses') or ()
+            emails = list(dict.fromkeys(
+                addr.lower() for e in email_vals if (addr := e.get('email_address'))
+            ))
+            
+            # One entry per record, shared by every email it is indexed under
+            rec = {
                 "id": rid,
                 "name": full_name,
                 "emails": emails,
                 "created_at": r.get('created_at')
-            })
+            }
+            for e in emails:
+                group = email_map[e]
+                group.append(rec)
+                if len(group) == 2:
+                    duplicates[e] = group
             
-    duplicates = {e: recs for e, recs in email_map.items() if len(recs) > 1}
     return duplicates
 
-def process_companies(records):
-    print("\nProcessing Companies...")
+async def process_companies(pages):
     domain_map = defaultdict(list)
     name_map = defaultdict(list)
+    dup_domains = {}
+    dup_names = {}
     
-    for r in records:
-        rid = r['id']['record_id']
-        values = r.get('values', {})
+    async for batch in pages:
+        for r in batch:
+            rid = r['id']['record_id']
+            values = r.get('values') or {}
         
-        # Extract Name
-        name = "Unknown"
-        name_vals = values.get('name', [])
-        if name_vals:
-            name = name_vals[0].get('value', 'Unknown')
+            # Extract Name
+            name = "Unknown"
+            name_vals = values.get('name') or ()
+            if name_vals:
+                name = name_vals[0].get('value', 'Unknown')
             
-        # Extract Domains
-        domains = []
-        domain_vals = values.get('domains', [])
-        for d in domain_vals:
-            dom = d.get('domain')
-            if dom:
-                domains.append(dom.lower())
-                
-        for d in domains:
-            domain_map[d].append({
-                "id": rid,
-                "name": name,
-                "domains": domains,
-                "created_at": r.get('created_at')
-            })
+            # Extract Domains, deduplicated (order kept) like emails above
+            domain_vals = values.get('domains') or ()
+            domains = list(dict.fromkeys(
+                dom.lower() for d in domain_vals if (dom := d.get('domain'))
+            ))
             
-        if name and name != "Unknown":
-            name_map[name.lower()].append({
+            # One entry per record, shared by the domain and name indexes
+            rec = {
                 "id": rid,
                 "name": name,
                 "domains": domains,
                 "created_at": r.get('created_at')
-            })
+            }
+            for d in domains:
+                group = domain_map[d]
+                group.append(rec)
+                if len(group) == 2:
+                    dup_domains[d] = group
+            
+            if name and name != "Unknown":
+                group = name_map[name.lower()]
+                group.append(rec)
+                if len(group) == 2:
+                    dup_names[name.lower()] = group
 
-    dup_domains = {d: recs for d, recs in domain_map.items() if len(recs) > 1}
-    dup_names = {n: recs for n, recs in name_map.items() if len(recs) > 1}
-    
     return dup_domains, dup_names
 
-def main():
+async def main():
     if not TOKEN:
         print("Error: ATTIO_API_TOKEN not found.")
         return
 
-    # Fetch Data
-    people = fetch_all_records("people")
-    companies = fetch_all_records("companies")
-    
-    # Find Duplicates
-    dup_people = process_people(people)
-    dup_comp_domains, dup_comp_names = process_companies(companies)
+    # Fetch and index both objects at once under one live display; each page
+    # is folded into the duplicate maps as it arrives, not collected first
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} records")
+        ) as progress:
+            dup_people, (dup_comp_domains, dup_comp_names) = await asyncio.gather(
+                process_people(iter_query_pages(CLIENT, "people", progress)),
+                process_companies(iter_query_pages(CLIENT, "companies", progress))
+            )
+    finally:
+        await CLIENT.aclose()
     
     # Report
     print("\n" + "="*50)
     print("DUPLICATE REPORT")
     print("="*50)
     
-    with open("duplicates_report.txt", "w") as f:
+    # Report lines are small and many; a 64 KiB buffer batches them into few writes
+    with open("duplicates_report.txt", "w", buffering=1 << 16) as f:
+        def emit(line):
+            """Send a report line to both the console and the file."""
+            print(line)
+            print(line, file=f)
+        
         f.write("DUPLICATE REPORT\n================\n\n")
         
         # PEOPLE
@@ -165,16 +148,12 @@ def main():
             f.write("-" * 40 + "\n")
             for email, recs in dup_people.items():
                 line = f"\nEmail: {email} ({len(recs)} records)"
-                print(line)
-                f.write(line + "\n")
-                
-                # Sort by creation time (keep oldest? user decides)
-                recs.sort(key=lambda x: x['created_at'])
+                emit(line)
                 
+                # Pages are fetched oldest first, so each group is already in creation order
                 for r in recs:
                     info = f"  - ID: {r['id']} | Name: {r['name']} | Created: {r['created_at']}"
-                    print(info)
-                    f.write(info + "\n")
+                    emit(info)
         
         # COMPANIES (DOMAINS)
         msg = f"Found {len(dup_comp_domains)} domains with duplicate Company records."
@@ -184,14 +163,10 @@ def main():
             f.write("-" * 40 + "\n")
             for domain, recs in dup_comp_domains.items():
                 line = f"\nDomain: {domain} ({len(recs)} records)"
-                print(line)
-                f.write(line + "\n")
-                
-                recs.sort(key=lambda x: x['created_at'])
+                emit(line)
                 for r in recs:
                     info = f"  - ID: {r['id']} | Name: {r['name']} | Created: {r['created_at']}"
-                    print(info)
-                    f.write(info + "\n")
+                    emit(info)
 
         # COMPANIES (NAMES)
         # Filter out name dups that are already caught by domain to avoid noise?
@@ -205,17 +180,13 @@ def main():
                 # Check if these records were already listed in domain dups?
                 # It's complex to dedup the report perfectly, listing them is safer.
                 line = f"\nName: {name} ({len(recs)} records)"
-                print(line)
-                f.write(line + "\n")
-                
-                recs.sort(key=lambda x: x['created_at'])
+                emit(line)
                 for r in recs:
                     info = f"  - ID: {r['id']} | Domains: {r['domains']} | Created: {r['created_at']}"
-                    print(info)
-                    f.write(info + "\n")
+                    emit(info)
 
     print(f"\nFull report saved to 'duplicates_report.txt'")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
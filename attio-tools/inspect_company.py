@@ -17,7 +17,40 @@ headers = {
 # ID from previous output for "twenty" (secondary)
 record_id = "d2ba3283-d350-42a3-bec4-730b20472fc7" 
 
+# Above this size, pretty-printing costs more than it helps: json.dumps with
+# indent runs the pure-Python encoder, so large bodies are echoed as received
+PRETTY_PRINT_MAX_CHARS = 256 * 1024
+
+# Last (ETag, body) per record, so repeat inspections are answered with a 304
+CACHE_DIR = Path.home() / ".cache" / "attio"
+cache_path = CACHE_DIR / f"record-{record_id}.json"
+try:
+    cached = json.loads(cache_path.read_text())
+except (OSError, ValueError):
+    cached = None
+# Only revalidate against an entry we can actually answer a 304 from
+if not (isinstance(cached, dict) and isinstance(cached.get("etag"), str) and isinstance(cached.get("body"), str)):
+    cached = None
+
+request_headers = headers
+if cached:
+    request_headers = {**headers, "If-None-Match": cached["etag"]}
+
 url = f"https://api.attio.com/v2/objects/companies/records/{record_id}"
-resp = requests.get(url, headers=headers)
-print(json.dumps(resp.json(), indent=2))
+resp = requests.get(url, headers=request_headers)
+if resp.status_code == 304 and not cached:
+    # A 304 we never asked for has no body to fall back on; fetch unconditionally
+    resp = requests.get(url, headers=headers)
+if resp.status_code == 304 and cached:
+    body = cached["body"]
+else:
+    body = resp.text
+    etag = resp.headers.get("ETag")
+    if resp.ok and etag:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"etag": etag, "body": body}))
 
+if len(body) > PRETTY_PRINT_MAX_CHARS:
+    print(body)
+else:
+    print(json.dumps(json.loads(body), indent=2))
@@ -1,10 +1,13 @@
 import os
-import requests
-import json
 import time
+import asyncio
+import httpx
+import json
 from dotenv import load_dotenv
 from collections import defaultdict
 from pathlib import Path
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
+from attio_common import make_client, attio_request, iter_query_pages
 
 # Load env relative to this file so path survives repo restructuring.
 BASE_DIR = Path(__file__).resolve().parent
@@ -12,55 +15,64 @@ ENV_PATH = BASE_DIR / "crm_migration" / ".env"
 load_dotenv(ENV_PATH)
 
 TOKEN = os.getenv("ATTIO_API_TOKEN")
-API_BASE_URL = "https://api.attio.com/v2"
 
-def get_headers():
-    return {
-        "Authorization": f"Bearer {TOKEN}",
-        "Content-Type": "application/json"
-    }
+# One pooled HTTP/2 client for the whole run; deletes and updates from
+# concurrent merge groups are multiplexed over its keep-alive connections
+CLIENT = make_client(
+    TOKEN,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30.0
+)
+
+# Merge groups processed at once; bounds request bursts against Attio's rate limits
+MERGE_CONCURRENCY = 10
 
-def fetch_all_companies():
-    print("Fetching all companies...")
-    url = f"{API_BASE_URL}/objects/companies/records/query"
-    records = []
-    limit = 1000
-    offset = 0
+# Attio allows 25 write requests per second per workspace
+WRITE_RATE = 25
+
+# A just-deleted record can hold its unique domains for a moment; the master
+# PATCH is retried this many times (with growing delays) on a uniqueness conflict
+CONFLICT_RETRIES = 5
+CONFLICT_BASE_DELAY = 0.5
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second, bursting up to `rate`."""
     
-    while True:
-        payload = {
-            "limit": limit,
-            "offset": offset,
-            "sort": {
-                "direction": "asc",
-                "attribute": "created_at"
-            }
-        }
-        
-        try:
-            resp = requests.post(url, headers=get_headers(), json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-            batch = data.get("data", [])
-            records.extend(batch)
-            print(f"  Fetched {len(batch)} records...")
-            
-            if len(batch) < limit:
-                break
-            offset += limit
-            
-        except Exception as e:
-            print(f"Error fetching companies: {e}")
-            break
-            
-    return records
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        # The lock queues waiters so tokens are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds):
+        """Hold every caller for `seconds`, e.g. when the server returns Retry-After."""
+        self.tokens = min(self.tokens, -seconds * self.rate)
+        self.updated = time.monotonic()
 
-def update_company_domains(record_id, domains):
+WRITE_LIMITER = TokenBucket(WRITE_RATE)
+
+def is_uniqueness_conflict(resp):
+    """True when Attio refused a write because a unique value is still taken."""
+    return resp.status_code == 409 or (resp.status_code == 400 and "uniqueness" in resp.text.lower())
+
+async def update_company_domains(record_id, domains):
     """
     Update the domains of a company record.
     domains: list of domain strings (e.g. ['a.com', 'b.com'])
     """
-    url = f"{API_BASE_URL}/objects/companies/records/{record_id}"
+    url = f"/objects/companies/records/{record_id}"
     
     # Construct payload for domains
     # Attio expects a list of objects with "domain" key
@@ -74,72 +86,44 @@ def update_company_domains(record_id, domains):
         }
     }
     
-    print(f"  -> Updating {record_id} with domains: {domains}")
-    try:
-        resp = requests.patch(url, headers=get_headers(), json=payload)
-        resp.raise_for_status()
-        print("     [OK] Update successful")
-        return True
-    except Exception as e:
-        print(f"     [ERR] Update failed: {e}")
-        if hasattr(e, 'response') and e.response:
-             print(f"     Response: {e.response.text}")
+    # Only failures are printed; progress is shown on the merge bar
+    for attempt in range(CONFLICT_RETRIES):
+        try:
+            resp = await attio_request(CLIENT, "PATCH", url, limiter=WRITE_LIMITER, json=payload)
+        except httpx.HTTPError as e:
+            print(f"     [ERR] Update of {record_id} failed: {e}")
+            return False
+        if not is_uniqueness_conflict(resp) or attempt == CONFLICT_RETRIES - 1:
+            break
+        # The deleted duplicates haven't released their domains yet
+        await asyncio.sleep(CONFLICT_BASE_DELAY * 2 ** attempt)
+    if resp.is_error:
+        print(f"     [ERR] Update of {record_id} failed: HTTP {resp.status_code}")
+        print(f"     Response: {resp.text}")
         return False
+    return True
 
-def delete_record(record_id):
-    url = f"{API_BASE_URL}/objects/companies/records/{record_id}"
-    print(f"  -> Deleting duplicate record {record_id}...")
+async def delete_record(record_id):
+    url = f"/objects/companies/records/{record_id}"
     try:
-        resp = requests.delete(url, headers=get_headers())
-        resp.raise_for_status()
-        print("     [OK] Delete successful")
+        resp = await attio_request(CLIENT, "DELETE", url, limiter=WRITE_LIMITER)
+    except httpx.HTTPError as e:
+        print(f"     [ERR] Delete of {record_id} failed: {e}")
+        return False
+    if resp.status_code == 404 and resp.extensions.get("attempts", 1) > 1:
+        # An earlier attempt committed but its response was lost; the record is gone
         return True
-    except Exception as e:
-        print(f"     [ERR] Delete failed: {e}")
+    if resp.is_error:
+        print(f"     [ERR] Delete of {record_id} failed: HTTP {resp.status_code}")
         return False
+    return True
 
-def main():
-    if not TOKEN:
-        print("Error: ATTIO_API_TOKEN not found.")
-        return
-
-    records = fetch_all_companies()
-    
-    # Group by Name
-    name_map = defaultdict(list)
-    for r in records:
-        rid = r['id']['record_id']
-        values = r.get('values', {})
-        
-        # Get Name
-        name_vals = values.get('name', [])
-        name = name_vals[0].get('value') if name_vals else None
-        
-        if not name:
-            continue
-            
-        # Get Domains
-        domains = []
-        domain_vals = values.get('domains', [])
-        for d in domain_vals:
-            if d.get('domain'):
-                domains.append(d.get('domain'))
-        
-        name_map[name.lower()].append({
-            "id": rid,
-            "name": name,
-            "domains": domains,
-            "created_at": r.get('created_at')
-        })
-    
-    # Filter for duplicates
-    duplicates = {n: recs for n, recs in name_map.items() if len(recs) > 1}
-    
-    print(f"\nFound {len(duplicates)} groups to merge.\n")
+async def merge_group(name, recs, semaphore):
+    """Fold one group of same-name companies into its oldest record.
     
-    for name, recs in duplicates.items():
-        print(f"Merging '{name}' ({len(recs)} records)...")
-        
+    Returns True once the master holds every domain; failures are printed.
+    """
+    async with semaphore:
         # Sort by creation date (oldest first)
         # They should be sorted from fetch, but ensuring it here
         recs.sort(key=lambda x: x['created_at'])
@@ -147,9 +131,6 @@ def main():
         master = recs[0]
         others = recs[1:]
         
-        print(f"  Master: {master['id']} (Created: {master['created_at']})")
-        print(f"  Others: {', '.join([o['id'] for o in others])}")
-        
         # Aggregate Domains
         all_domains = set(master['domains'])
         for o in others:
@@ -157,34 +138,83 @@ def main():
         
         final_domains = list(all_domains)
         
-        print(f"  -> Consolidated domains: {final_domains}")
-        
         # STRATEGY CHANGE: Attio enforces unique domains.
         # We must DELETE the secondary records first to free up their domains.
         
-        # 1. Delete Others
-        delete_success = True
-        for o in others:
-            if not delete_record(o['id']):
-                delete_success = False
-                print("     [WARN] Failed to delete a secondary record. Aborting update to prevent data loss or conflicts.")
-                break
-            # Rate limit safety
-            time.sleep(0.5)
+        # 1. Delete Others (independent of each other, so sent together)
+        deleted = await asyncio.gather(*[delete_record(o['id']) for o in others])
+        if not all(deleted):
+            print(f"     [WARN] '{name}': failed to delete a secondary record. Aborting update to prevent data loss or conflicts.")
+            print(f"     Records that were deleted may have held these domains; restore onto master "
+                  f"{master['id']} if missing: {final_domains}")
+            return False
+            
+        # 2. Update Master (retried while the deleted records still hold their domains)
+        if not await update_company_domains(master['id'], final_domains):
+            print(f"     [ERR] '{name}': failed to update master {master['id']}. Domains from deleted records "
+                  f"might need manual restoration: {final_domains}")
+            return False
+        return True
+
+async def main():
+    if not TOKEN:
+        print("Error: ATTIO_API_TOKEN not found.")
+        return
+
+    # A single live display replaces the per-group and per-page prints
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn()
+    )
+    try:
+        with progress:
+            # Group by Name, page by page as the companies stream in
+            name_map = defaultdict(list)
+            # Groups are registered when they get a second record, skipping a
+            # filtering pass over every singleton afterwards
+            duplicates = {}
+            async for batch in iter_query_pages(CLIENT, "companies", progress):
+                for r in batch:
+                    rid = r['id']['record_id']
+                    values = r.get('values') or {}
+                    
+                    # Get Name
+                    name_vals = values.get('name') or ()
+                    name = name_vals[0].get('value') if name_vals else None
+                    
+                    if not name:
+                        continue
+                    
+                    # Get Domains (one lookup per entry)
+                    domain_vals = values.get('domains') or ()
+                    domains = [dom for d in domain_vals if (dom := d.get('domain'))]
+                    
+                    group = name_map[name.lower()]
+                    group.append({
+                        "id": rid,
+                        "name": name,
+                        "domains": domains,
+                        "created_at": r.get('created_at')
+                    })
+                    if len(group) == 2:
+                        duplicates[name.lower()] = group
             
-        if not delete_success:
-            continue
+            task = progress.add_task("Merging groups", total=len(duplicates))
+            # Groups touch disjoint records, so merge several at once under the semaphore
+            semaphore = asyncio.Semaphore(MERGE_CONCURRENCY)
             
-        # 2. Update Master
-        # We need to wait a moment for consistency?
-        time.sleep(1.0)
-        
-        if update_company_domains(master['id'], final_domains):
-             print("     [SUCCESS] Merge complete.")
-        else:
-             print("     [ERR] Failed to update master. Domains from deleted records might need manual restoration.")
+            async def merge_and_advance(name, recs):
+                merged = await merge_group(name, recs, semaphore)
+                progress.advance(task)
+                return merged
             
-        print("-" * 30)
+            results = await asyncio.gather(*[merge_and_advance(name, recs) for name, recs in duplicates.items()])
+    finally:
+        await CLIENT.aclose()
+    
+    print(f"\nMerged {sum(results)} of {len(duplicates)} duplicate groups.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())